@@ -3,7 +3,7 @@ Repo Agent - A2A server using LangGraph and Claude Code CLI.
 
 Logs per task:
 - {task_id}.log        - System logs
-- {task_id}_claude.log - Claude Code thinking
+- {task_id}_{node}_claude.log - Claude Code thinking
 """
 
 __version__ = "0.1.0"
@@ -4,23 +4,45 @@ Claude Code CLI integration.
 Singleton agent for all interactions with Claude Code CLI.
 """
 
-import subprocess
-import json
+import asyncio
+import fcntl
 import os
+import signal
 import time
-from datetime import datetime
-from typing import Tuple, Optional
+from typing import BinaryIO, Tuple, Optional
 
+import msgspec
+
+from repo_agent.utils import llm_cache
 from repo_agent.utils.system_logger import logger
 
 
+# Log separators, built once
+_RULE_BYTES = b"=" * 80 + b"\n"
+_BAR_BYTES = b"\n" + _RULE_BYTES
+_RESPONSE_HEADER_BYTES = _BAR_BYTES + b"PARSED RESPONSE:\n" + _RULE_BYTES
+
+
+class ResultEvent(msgspec.Struct):
+    """The fields we need from the stream-json "result" event (others are skipped)."""
+    result: Optional[str] = None
+    session_id: Optional[str] = None
+
+
+_decode_result = msgspec.json.Decoder(ResultEvent).decode
+
+# Environment for the CLI (needed for auth tokens), captured once at import.
+# Subprocess spawning never mutates it; use {**_BASE_ENV, **overrides} for per-call changes.
+_BASE_ENV = dict(os.environ)
+
+
 class ClaudeAgent:
     """
     Singleton Claude Code CLI agent.
     
     Usage:
         from repo_agent.claude import claude_agent
-        result, duration, exit_code = claude_agent.call(prompt, repo_path, task_id, node)
+        result, duration, exit_code, session_id = await claude_agent.call(prompt, repo_path, task_id, node)
     """
     
     _instance: Optional['ClaudeAgent'] = None
@@ -29,6 +51,7 @@ class ClaudeAgent:
     DEFAULT_CLAUDE_PATH = "/opt/homebrew/bin/claude"
     DEFAULT_MAX_TURNS = 5
     DEFAULT_TIMEOUT = 300  # 5 minutes
+    PIPE_BUFFER_SIZE = 1 << 20  # 1 MiB max stdout line / StreamReader buffer, and kernel pipe buffer
     
     def __new__(cls) -> 'ClaudeAgent':
         if cls._instance is None:
@@ -47,15 +70,18 @@ class ClaudeAgent:
         
         logger.console.info(f"ClaudeAgent initialized: {self.claude_path}")
     
-    def call(
+    async def call(
         self,
         prompt: str,
         repo_path: str,
         task_id: str,
         node: str,
         max_turns: Optional[int] = None,
-        timeout: Optional[int] = None
-    ) -> Tuple[str, float, int]:
+        timeout: Optional[int] = None,
+        no_cache: bool = False,
+        resume: Optional[str] = None,
+        fork_session: bool = False
+    ) -> Tuple[str, float, int, str]:
         """
         Call Claude Code CLI and stream output to file.
         
@@ -66,18 +92,33 @@ class ClaudeAgent:
             node: Node name for logging (e.g., "generator_v1")
             max_turns: Maximum tool calls (default: instance config)
             timeout: Timeout in seconds (default: instance config)
+            no_cache: Skip the on-disk response cache for this call
+            resume: Session ID to resume, so the cached conversation prefix is reused
+            fork_session: Resume into a new session instead of appending to `resume`
         
         Returns:
-            Tuple of (result_text, duration_seconds, exit_code)
+            Tuple of (result_text, duration_seconds, exit_code, session_id)
         """
         max_turns = max_turns or self.max_turns
         timeout = timeout or self.timeout
         
+        cache_key = None
+        if not no_cache:
+            cache_key = llm_cache.make_key(prompt, repo_path, max_turns, resume or "")
+            cached = llm_cache.get(cache_key)
+            # Entries are [output, duration, exit_code, session_id]; anything else is treated as a miss
+            if (isinstance(cached, list) and len(cached) == 4
+                    and isinstance(cached[0], str) and isinstance(cached[3], str)):
+                logger.log(task_id, f"{node}: Cache hit", details={"key": cache_key[:12]})
+                return cached[0], 0.0, 0, cached[3]
+        
         start_time = time.time()
         
         # Output file for Claude's stream-json
         logs_dir = logger.base_log_dir
-        output_file = os.path.join(logs_dir, f"{task_id}_claude.log")
+        # One file per call (node names are unique per task), so concurrent calls never interleave
+        output_file = os.path.join(logs_dir, f"{task_id}_{node}_claude.log")
+        stderr_file = f"{output_file}.err"
         
         cmd = [
             self.claude_path,
@@ -85,107 +126,152 @@ class ClaudeAgent:
             "--verbose",
             "--output-format", "stream-json",
             "--dangerously-skip-permissions",
-            "--max-turns", str(max_turns),
-            "--continue"
+            "--max-turns", str(max_turns)
         ]
+        if resume:
+            cmd += ["--resume", resume]
+            if fork_session:
+                cmd.append("--fork-session")
         
-        # Inherit full environment (needed for auth tokens)
-        env = os.environ.copy()
-        
+        process = None
         try:
-            # Write header
-            self._write_header(output_file, node, repo_path, prompt)
-            
-            # Stream Claude output directly to file
-            with open(output_file, 'a') as f:
-                process = subprocess.Popen(
-                    cmd,
+            # One buffered handle for header, stream, footer and response;
+            # stderr goes straight to its own file so it never fills a pipe
+            with open(output_file, 'ab', buffering=65536) as f, open(stderr_file, 'ab') as err:
+                self._write_header(f, node, repo_path, prompt)
+                
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
                     cwd=repo_path,
-                    stdout=f,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    env=env
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=err,
+                    env=_BASE_ENV,
+                    start_new_session=True,
+                    limit=self.PIPE_BUFFER_SIZE
                 )
-                _, stderr = process.communicate(timeout=timeout)
-                exit_code = process.returncode
-            
-            duration = time.time() - start_time
-            
-            # Write footer
-            self._write_footer(output_file, duration, exit_code)
-            
-            # Parse the result from the file
-            output = self._parse_result(output_file)
-            
-            if exit_code != 0 and not output:
-                output = f"Error: {stderr.strip()}" if stderr else "Unknown error"
+                self._grow_pipe(process)
+                
+                # Stream Claude output directly to file without blocking the event loop,
+                # picking up the final result event as it goes by
+                output = ""
+                session_id = ""
+                
+                async def stream_stdout():
+                    nonlocal output, session_id
+                    while True:
+                        try:
+                            line = await process.stdout.readuntil(b"\n")
+                        except asyncio.IncompleteReadError as e:
+                            line = e.partial  # EOF (possibly with an unterminated last line)
+                        except asyncio.LimitOverrunError as e:
+                            # Line longer than the read limit (e.g. a huge tool result): pass it through unparsed
+                            f.write(await process.stdout.readexactly(e.consumed))
+                            continue
+                        if not line:
+                            break
+                        f.write(line)
+                        if line.startswith(b'{"type":"result"'):
+                            try:
+                                event = _decode_result(line)
+                                output = event.result or ""
+                                session_id = event.session_id or ""
+                            except msgspec.DecodeError:
+                                pass
+                
+                try:
+                    _, exit_code = await asyncio.wait_for(
+                        asyncio.gather(stream_stdout(), process.wait()),
+                        timeout
+                    )
+                except asyncio.TimeoutError:
+                    await self._kill(process)
+                    duration = time.time() - start_time
+                    self._write_footer(f, duration, -1, timeout=True)
+                    return f"Error: Timed out after {timeout}s", duration, -1, ""
+                duration = time.time() - start_time
+                self._write_footer(f, duration, exit_code)
+                
+                if exit_code != 0 and not output:
+                    stderr = self._read_tail(stderr_file)
+                    output = f"Error: {stderr.strip()}" if stderr.strip() else "Unknown error"
+                
+                self._write_response(f, output)
             
             # Log the response
-            self._write_response(output_file, output)
             logger.log(task_id, f"{node}: Response", details={
                 "output_length": len(output), 
                 "preview": output[:200] if output else "empty"
             })
             
-            return output, duration, exit_code
+            if cache_key and exit_code == 0 and output:
+                try:
+                    llm_cache.set(cache_key, [output, duration, exit_code, session_id])
+                except OSError as e:
+                    # A cache failure must not cost us a good answer
+                    logger.console.warning(f"[{task_id}] {node}: Failed to cache response: {e}")
+            
+            return output, duration, exit_code, session_id
             
-        except subprocess.TimeoutExpired:
-            process.kill()
-            duration = time.time() - start_time
-            self._write_footer(output_file, duration, -1, timeout=True)
-            return f"Error: Timed out after {timeout}s", duration, -1
+        except asyncio.CancelledError:
+            if process is not None and process.returncode is None:
+                await self._kill(process)
+            raise
             
         except FileNotFoundError:
-            return f"Error: Claude CLI not found at {self.claude_path}", 0, -1
+            return f"Error: Claude CLI not found at {self.claude_path}", 0, -1, ""
             
         except Exception as e:
-            return f"Error: {str(e)}", time.time() - start_time, -1
+            return f"Error: {str(e)}", time.time() - start_time, -1, ""
     
-    def _parse_result(self, output_file: str) -> str:
-        """Parse the final result from stream-json output."""
+    def _grow_pipe(self, process: asyncio.subprocess.Process):
+        """
+        Raise the stdout pipe's kernel buffer to PIPE_BUFFER_SIZE (Linux only, best effort).
+        
+        asyncio has no public way to get the pipe's fd, so this deliberately reaches into
+        process._transport; if that internal ever changes, the AttributeError is swallowed
+        and the default pipe size is kept.
+        """
+        if not hasattr(fcntl, "F_SETPIPE_SZ"):
+            return
         try:
-            with open(output_file, 'r') as f:
-                lines = f.readlines()
-                
-            for line in reversed(lines):
-                line = line.strip()
-                if not line or not line.startswith('{'):
-                    continue
-                try:
-                    event = json.loads(line)
-                    if event.get("type") == "result":
-                        return event.get("result", "")
-                except json.JSONDecodeError:
-                    continue
-        except Exception:
+            pipe = process._transport.get_pipe_transport(1).get_extra_info("pipe")
+            fcntl.fcntl(pipe.fileno(), fcntl.F_SETPIPE_SZ, self.PIPE_BUFFER_SIZE)
+        except (AttributeError, OSError):
+            # Capped by /proc/sys/fs/pipe-max-size; the default buffer still works
             pass
-        return ""
     
-    def _write_header(self, output_file: str, node: str, repo_path: str, prompt: str):
+    async def _kill(self, process: asyncio.subprocess.Process):
+        """Kill Claude and any tool processes it spawned, then reap it."""
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        await process.wait()
+    
+    def _read_tail(self, path: str, size: int = 4096) -> str:
+        """Read the last `size` bytes of a file."""
+        with open(path, 'rb') as f:
+            f.seek(max(0, os.fstat(f.fileno()).st_size - size))
+            return f.read().decode(errors="replace")
+    
+    def _write_header(self, f: BinaryIO, node: str, repo_path: str, prompt: str):
         """Write log header."""
-        with open(output_file, 'a') as f:
-            f.write(f"\n{'='*80}\n")
-            f.write(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {node.upper()}\n")
-            f.write(f"Repo: {repo_path}\n")
-            f.write(f"Prompt: {prompt}\n")
-            f.write(f"{'='*80}\n")
+        f.write(_BAR_BYTES)
+        f.write(f"[{logger.timestamp()}] {node.upper()}\nRepo: {repo_path}\nPrompt: {prompt}\n".encode())
+        f.write(_RULE_BYTES)
     
-    def _write_footer(self, output_file: str, duration: float, exit_code: int, timeout: bool = False):
+    def _write_footer(self, f: BinaryIO, duration: float, exit_code: int, timeout: bool = False):
         """Write log footer."""
-        with open(output_file, 'a') as f:
-            if timeout:
-                f.write(f"\n[TIMEOUT after {duration:.2f}s]\n")
-            else:
-                f.write(f"\n[Completed in {duration:.2f}s, exit: {exit_code}]\n")
+        if timeout:
+            f.write(f"\n[TIMEOUT after {duration:.2f}s]\n".encode())
+        else:
+            f.write(f"\n[Completed in {duration:.2f}s, exit: {exit_code}]\n".encode())
     
-    def _write_response(self, output_file: str, response: str):
+    def _write_response(self, f: BinaryIO, response: str):
         """Write parsed response to log."""
-        with open(output_file, 'a') as f:
-            f.write(f"\n{'='*80}\n")
-            f.write(f"PARSED RESPONSE:\n")
-            f.write(f"{'='*80}\n")
-            f.write(response if response else "(empty)")
-            f.write(f"\n{'='*80}\n")
+        f.write(_RESPONSE_HEADER_BYTES)
+        f.write(response.encode() if response else b"(empty)")
+        f.write(_BAR_BYTES)
 
 
 # Global singleton instance
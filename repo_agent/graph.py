@@ -7,11 +7,13 @@ Flow:
 
 Logs:
 - {task_id}.log        - System logs
-- {task_id}_claude.log - Claude Code stream output
+- {task_id}_{node}_claude.log - Claude Code stream output
 """
 
+import re
 import uuid
-from typing import TypedDict, Literal
+import asyncio
+from typing import TypedDict, Literal, Optional, Tuple
 from langgraph.graph import StateGraph, START, END
 
 from repo_agent.claude import claude_agent
@@ -23,14 +25,20 @@ class AgentState(TypedDict):
     query: str
     repo_path: str
     answer: str
+    answer_ok: bool  # Last generator call exited 0 with a non-empty result
     validation: str
     validation_status: str  # VALID, INVALID, PARTIAL
     feedback: str
+    session_id: str  # Generator's Claude session, resumed to reuse the cached context
     iteration: int
     max_iterations: int
 
 
-def generator_node(state: AgentState) -> dict:
+# Stable prompt prefix shared by every call, so it stays in Claude's prompt cache
+PREAMBLE = "You are a principal engineer who has expertise in understanding code fast and to answer queries."
+
+
+async def generator_node(state: AgentState) -> dict:
     """Generate answer, incorporating feedback if available."""
     task_id = state["task_id"]
     iteration = state.get("iteration", 1)
@@ -38,70 +46,139 @@ def generator_node(state: AgentState) -> dict:
     
     logger.log(task_id, f"Generator: Starting (iteration {iteration})")
     
+    # Stable prefix first, variable feedback tail last
+    prompt = f"{PREAMBLE} With your expertise please answer this query: {state['query']}"
     if feedback:
-        # Regenerate with feedback
-        prompt = f"""Previous answer was marked as needing improvement.
+        # Regenerate with feedback, resuming the previous generator session
+        prompt += f"""
 
-Feedback: {feedback}
+Previous answer was marked as needing improvement.
 
-Original question: {state['query']}
+Feedback: {feedback}
 
 Please provide an improved, complete answer addressing the feedback."""
-    else:
-        # First generation
-        prompt = (f"You are a principle engineer who has expertise in understanding code fast and to answer queries. "
-                  f"With your expertise please answer this query: {state['query']}")
     
-    answer, duration, _ = claude_agent.call(prompt, state["repo_path"], task_id, f"generator_v{iteration}")
+    answer, duration, exit_code, session_id = await claude_agent.call(
+        prompt, state["repo_path"], task_id, f"generator_v{iteration}",
+        resume=state.get("session_id") if feedback else None
+    )
     
     logger.log(task_id, f"Generator: Done ({duration:.1f}s)")
     
-    return {"answer": answer}
+    return {
+        "answer": answer,
+        "answer_ok": exit_code == 0 and bool(answer),
+        "session_id": session_id or state.get("session_id", "")
+    }
+
+
+# Heuristics for skipping the Claude validator on answers that are clearly fine
+FAST_VALID_MIN_LENGTH = 200
+# Backticked code, file:line, or a path ending in a file extension (not prose like "input/output")
+CODE_CITATION_RE = re.compile(r"`[^`\n]+`|\w+\.\w+:\d+|\w+/[\w/.-]*\.\w+")
+QUERY_WORD_RE = re.compile(r"[a-z_][a-z0-9_]{3,}")
+STOPWORDS = {"what", "which", "where", "when", "does", "this", "that", "there", "their", "with",
+             "from", "have", "into", "about", "used", "explain", "describe", "please", "repo"}
+
+
+def query_keywords_present(answer: str, query: str) -> bool:
+    """True if at least half of the query's significant words appear in the answer."""
+    keywords = set(QUERY_WORD_RE.findall(query.lower())) - STOPWORDS
+    if not keywords:
+        return True
+    answer_lower = answer.lower()
+    return sum(k in answer_lower for k in keywords) * 2 >= len(keywords)
+
+
+def fast_validate(answer: str, query: str) -> Optional[str]:
+    """Return "VALID" when cheap checks are confident enough to skip Claude, else None."""
+    if (len(answer) > FAST_VALID_MIN_LENGTH
+            and not answer.startswith("Error:")
+            and CODE_CITATION_RE.search(answer)
+            and query_keywords_present(answer, query)):
+        return "VALID"
+    return None
+
+
+def parse_status(validation: str) -> str:
+    """Parse VALID / INVALID / PARTIAL from a validator response (VALID if unparseable)."""
+    validation_upper = validation.strip().upper()
+    for status in ("INVALID", "PARTIAL"):
+        if validation_upper.startswith(status):
+            return status
+    return "VALID"
 
 
-def validator_node(state: AgentState) -> dict:
+async def validator_node(state: AgentState) -> dict:
     """Validate the answer. Returns status: VALID, INVALID, or PARTIAL."""
     task_id = state["task_id"]
     iteration = state.get("iteration", 1)
     
     logger.log(task_id, f"Validator: Starting (iteration {iteration})")
     
-    prompt = f"""You are validating an answer about a codebase.
+    if fast_validate(state["answer"], state["query"]) == "VALID":
+        logger.log(task_id, "Validator: VALID (fast path, Claude skipped)")
+        return {
+            "validation": "VALID",
+            "validation_status": "VALID",
+            "feedback": "",
+            "iteration": iteration
+        }
+    
+    # Correctness and completeness are independent checks, so run them concurrently
+    prefix = f"""{PREAMBLE} You are validating an answer about a codebase.
 
 Question: {state['query']}
-
-Answer to validate:
-{state['answer']}
-
+"""
+    correctness_prompt = f"""{prefix}
 Instructions:
 1. Check if the answer correctly addresses the question
 2. Verify code references are accurate (if any)
-3. Check for completeness
 
 Respond with EXACTLY one of these formats:
-- "VALID" - if the answer is correct and complete
+- "VALID" - if the answer is factually correct
 - "INVALID: <specific issues>" - if there are factual errors
-- "PARTIAL: <what's missing>" - if partially correct but incomplete
 
-Start your response with VALID, INVALID, or PARTIAL."""
+Start your response with VALID or INVALID.
+
+Answer to validate:
+{state['answer']}"""
+    completeness_prompt = f"""{prefix}
+Instructions:
+1. Check if the answer covers everything the question asks for
+
+Respond with EXACTLY one of these formats:
+- "VALID" - if the answer is complete
+- "PARTIAL: <what's missing>" - if the answer is incomplete
+
+Start your response with VALID or PARTIAL.
 
-    validation, duration, _ = claude_agent.call(prompt, state["repo_path"], task_id, f"validator_v{iteration}")
+Answer to validate:
+{state['answer']}"""
+
+    # Fork the generator's session so its cached context is reused without polluting it
+    session_id = state.get("session_id") or None
+    (correctness, correctness_duration, _, _), (completeness, completeness_duration, _, _) = await asyncio.gather(
+        claude_agent.call(
+            correctness_prompt, state["repo_path"], task_id, f"validator_correctness_v{iteration}",
+            resume=session_id, fork_session=True
+        ),
+        claude_agent.call(
+            completeness_prompt, state["repo_path"], task_id, f"validator_completeness_v{iteration}",
+            resume=session_id, fork_session=True
+        )
+    )
+    duration = max(correctness_duration, completeness_duration)
     
-    # Parse validation status
-    validation_upper = validation.strip().upper()
-    if validation_upper.startswith("VALID"):
-        status = "VALID"
-        feedback = ""
-    elif validation_upper.startswith("INVALID"):
-        status = "INVALID"
-        feedback = validation
-    elif validation_upper.startswith("PARTIAL"):
-        status = "PARTIAL"
-        feedback = validation
-    else:
-        # Default to VALID if we can't parse
-        status = "VALID"
-        feedback = ""
+    # Factual errors outrank missing detail
+    issues = []
+    if parse_status(correctness) == "INVALID":
+        issues.append(correctness)
+    if parse_status(completeness) == "PARTIAL":
+        issues.append(completeness)
+    status = parse_status(issues[0]) if issues else "VALID"
+    validation = "\n\n".join(issues) if issues else "VALID"
+    feedback = validation if status != "VALID" else ""
     
     logger.log(task_id, f"Validator: {status} ({duration:.1f}s)")
     
@@ -158,22 +235,24 @@ def create_graph():
 review_critique_graph = create_graph()
 
 
-def run_review_critique(query: str, repo_path: str, task_id: str = None) -> str:
-    """Run the review/critique workflow. Returns just the final answer."""
+async def run_review_critique(query: str, repo_path: str, task_id: str = None) -> Tuple[str, bool]:
+    """Run the review/critique workflow. Returns (final answer, whether Claude produced it successfully)."""
     if task_id is None:
         task_id = str(uuid.uuid4())[:8]
     
     logger.log(task_id, "Workflow: Started", details={"query": query, "repo": repo_path})
     
     try:
-        result = review_critique_graph.invoke({
+        result = await review_critique_graph.ainvoke({
             "task_id": task_id,
             "query": query,
             "repo_path": repo_path,
             "answer": "",
+            "answer_ok": False,
             "validation": "",
             "validation_status": "",
             "feedback": "",
+            "session_id": "",
             "iteration": 1,
             "max_iterations": 3
         })
@@ -182,8 +261,8 @@ def run_review_critique(query: str, repo_path: str, task_id: str = None) -> str:
         iterations = result.get("iteration", 1)
         logger.log(task_id, f"Workflow: Completed ({status} after {iterations} iteration(s))")
         
-        return result["answer"]
+        return result["answer"], result.get("answer_ok", False)
         
     except Exception as e:
         logger.log(task_id, f"Workflow: Failed - {str(e)}", level="ERROR")
-        return f"Error: {str(e)}"
+        return f"Error: {str(e)}", False
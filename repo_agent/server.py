@@ -3,7 +3,7 @@ A2A Server - LangGraph + Claude Code.
 
 Logs per task:
 - tmp/logs/{task_id}.log        - System logs
-- tmp/logs/{task_id}_claude.log - Claude Code thinking
+- tmp/logs/{task_id}_{node}_claude.log - Claude Code thinking
 
 Usage:
   python -m repo_agent.server --repo /path/to/repo
@@ -11,20 +11,29 @@ Usage:
 """
 
 import os
+import time
 import uuid
 import argparse
-from datetime import datetime, timezone
-from fastapi import FastAPI
+import msgspec
+from collections import OrderedDict
+from fastapi import FastAPI, Request, Response
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 from repo_agent.utils.init_logs import init_log_dirs
+from repo_agent.utils.llm_cache import repo_version
 from repo_agent.utils.system_logger import logger
 from repo_agent.graph import run_review_critique
 
 
-app = FastAPI(title="Repo Expert A2A Server")
+class MsgspecJSONResponse(JSONResponse):
+    """JSONResponse encoded with msgspec instead of the stdlib json module."""
+    
+    def render(self, content: Any) -> bytes:
+        return msgspec.json.encode(content)
+
+
+app = FastAPI(title="Repo Expert A2A Server", default_response_class=MsgspecJSONResponse)
 
 # Default repo path - can be overridden via CLI --repo argument
 DEFAULT_REPO_PATH = "/Users/chirag.chiranjib/razorpay/golang/ebpf-openapi/keploy"
@@ -32,30 +41,32 @@ DEFAULT_REPO_PATH = "/Users/chirag.chiranjib/razorpay/golang/ebpf-openapi/keploy
 # Runtime repo path (set by main())
 REPO_PATH = DEFAULT_REPO_PATH
 
+# In-process LRU of answers: (query, repo_path) -> (repo_version, answer)
+ANSWER_CACHE: "OrderedDict[Tuple[str, str], Tuple[tuple, str]]" = OrderedDict()
+ANSWER_CACHE_MAX = 128
 
-class JsonRpcRequest(BaseModel):
+
+class JsonRpcRequest(msgspec.Struct):
     jsonrpc: str
     method: str
     id: str
     params: Optional[Dict[str, Any]] = None
 
 
-@app.get("/.well-known/agent.json")
-async def agent_card():
-    """A2A Agent Card."""
-    return {
-        "name": "repo_expert",
-        "description": "Repository expert using Claude Code with review/critique pattern",
-        "version": "0.1.0",
-        "protocolVersion": "0.3.0",
-        "url": f"http://localhost:{os.environ.get('PORT', '8001')}",
-        "capabilities": {},
-        "defaultInputModes": ["text/plain"],
-        "defaultOutputModes": ["text/plain"],
-        "skills": [{
-            "id": "analyze_repo",
-            "name": "Repository Analysis",
-            "description": """Analyzes code repositories and answers questions about them.
+# A2A Agent Card, encoded once at import (PORT is read at startup)
+AGENT_CARD = {
+    "name": "repo_expert",
+    "description": "Repository expert using Claude Code with review/critique pattern",
+    "version": "0.1.0",
+    "protocolVersion": "0.3.0",
+    "url": f"http://localhost:{os.environ.get('PORT', '8001')}",
+    "capabilities": {},
+    "defaultInputModes": ["text/plain"],
+    "defaultOutputModes": ["text/plain"],
+    "skills": [{
+        "id": "analyze_repo",
+        "name": "Repository Analysis",
+        "description": """Analyzes code repositories and answers questions about them.
 
 INPUT FORMAT: Your message MUST include the repository path in this format:
   <your question> repo_path: /absolute/path/to/repository
@@ -66,41 +77,84 @@ EXAMPLES:
   - "Find security issues repo_path: /var/www/webapp"
 
 The agent will analyze the repository using Claude Code and validate the answer.""",
-            "tags": ["code", "repository", "analysis", "claude"]
-        }]
-    }
+        "tags": ["code", "repository", "analysis", "claude"]
+    }]
+}
+AGENT_CARD_JSON = msgspec.json.encode(AGENT_CARD)
+
+
+@app.get("/.well-known/agent.json")
+async def agent_card():
+    """A2A Agent Card."""
+    return Response(content=AGENT_CARD_JSON, media_type="application/json")
 
 
 @app.get("/.well-known/agent-card.json")
 async def agent_card_alt():
-    return await agent_card()
+    return Response(content=AGENT_CARD_JSON, media_type="application/json")
+
+
+def get_cached_answer(query: str, repo_path: str, version: tuple) -> Optional[str]:
+    """Return the cached answer if the repo hasn't changed since it was produced."""
+    key = (query, repo_path)
+    cached = ANSWER_CACHE.get(key)
+    if cached is None or cached[0] != version:
+        return None
+    ANSWER_CACHE.move_to_end(key)
+    return cached[1]
+
+
+def set_cached_answer(query: str, repo_path: str, version: tuple, answer: str):
+    """Store an answer, evicting the least recently used entry when full."""
+    key = (query, repo_path)
+    ANSWER_CACHE[key] = (version, answer)
+    ANSWER_CACHE.move_to_end(key)
+    if len(ANSWER_CACHE) > ANSWER_CACHE_MAX:
+        ANSWER_CACHE.popitem(last=False)
 
 
 def extract_params(text: str) -> tuple[str, str]:
     """Extract query and repo_path from message."""
-    if "repo_path:" not in text.lower():
+    before, sep, _ = text.lower().partition("repo_path:")
+    if not sep:
         return text.strip(), ""
     
-    idx = text.lower().find("repo_path:")
+    idx = len(before)
     query = text[:idx].strip()
-    repo_path = text[idx + len("repo_path:"):].strip().split()[0]
+    tokens = text[idx + len(sep):].split(None, 1)
+    repo_path = tokens[0] if tokens else ""
     
     return query or "What is this repository about?", repo_path
 
 
 @app.post("/")
-async def handle_jsonrpc(request: JsonRpcRequest):
+async def handle_jsonrpc(request: Request):
     """Handle A2A requests."""
 
-    if request.method != "message/send":
-        return JSONResponse({
+    try:
+        rpc = msgspec.json.decode(await request.body(), type=JsonRpcRequest)
+    except msgspec.ValidationError as e:
+        return MsgspecJSONResponse({
+            "jsonrpc": "2.0",
+            "id": None,
+            "error": {"code": -32600, "message": f"Invalid Request: {e}"}
+        })
+    except msgspec.DecodeError as e:
+        return MsgspecJSONResponse({
+            "jsonrpc": "2.0",
+            "id": None,
+            "error": {"code": -32700, "message": f"Parse error: {e}"}
+        })
+
+    if rpc.method != "message/send":
+        return MsgspecJSONResponse({
             "jsonrpc": "2.0",
-            "id": request.id,
-            "error": {"code": -32601, "message": f"Method not found: {request.method}"}
+            "id": rpc.id,
+            "error": {"code": -32601, "message": f"Method not found: {rpc.method}"}
         })
 
     # Extract message
-    params = request.params or {}
+    params = rpc.params or {}
     message = params.get("message", {})
     parts = message.get("parts", [])
     
@@ -111,9 +165,9 @@ async def handle_jsonrpc(request: JsonRpcRequest):
             break
     
     if not text:
-        return JSONResponse({
+        return MsgspecJSONResponse({
             "jsonrpc": "2.0",
-            "id": request.id,
+            "id": rpc.id,
             "error": {"code": -32602, "message": "No text in message"}
         })
     
@@ -126,21 +180,29 @@ async def handle_jsonrpc(request: JsonRpcRequest):
     
     logger.log(task_id, "A2A Request", details={"query": query, "repo": repo_path})
     
-    response = run_review_critique(query, repo_path, task_id)
+    version = repo_version(repo_path)
+    response = get_cached_answer(query, repo_path, version)
+    if response is not None:
+        logger.log(task_id, "A2A Answer served from in-process cache")
+    else:
+        response, ok = await run_review_critique(query, repo_path, task_id)
+        # Only cache real successes, so a transient CLI failure is retried on the next request
+        if ok:
+            set_cached_answer(query, repo_path, version, response)
     
     logger.log(task_id, "A2A Response sent")
     
     # Generate context ID (required by Google A2A agent)
     context_id = str(uuid.uuid4())
     
-    return JSONResponse({
+    return MsgspecJSONResponse({
         "jsonrpc": "2.0",
-        "id": request.id,
+        "id": rpc.id,
         "result": {
             "id": task_id,
             "contextId": context_id,
             "kind": "task",
-            "status": {"state": "completed", "timestamp": datetime.now(timezone.utc).isoformat()},
+            "status": {"state": "completed", "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())},
             "artifacts": [{"parts": [{"kind": "text", "text": response}]}]
         }
     })
@@ -184,8 +246,8 @@ def main():
 ║  Logs:   {logs_dir:<46}║
 ║                                                           ║
 ║  Log files per task:                                      ║
-║    {{task_id}}.log        - System logs                    ║
-║    {{task_id}}_claude.log - Claude Code thinking           ║
+║    {{task_id}}.log               - System logs              ║
+║    {{task_id}}_{{node}}_claude.log - Claude Code thinking     ║
 ╚═══════════════════════════════════════════════════════════╝
 """)
     
@@ -0,0 +1,98 @@
+"""
+On-disk cache for Claude CLI responses.
+
+- tmp/llm_cache/{sha256}.json - one cached response per prompt hash
+
+Keys include the repo's version (see repo_version), so commits and checkouts
+invalidate them. Entries expire after CLAUDE_CACHE_TTL_DAYS days (default: 7),
+based on file mtime; expired files are deleted on lookup and pruned on every set().
+"""
+
+import os
+import json
+import time
+import hashlib
+from typing import Any, Optional
+
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CACHE_DIR = os.path.join(project_root, "tmp", "llm_cache")
+
+DEFAULT_TTL_DAYS = 7
+TTL_SECONDS = float(os.environ.get("CLAUDE_CACHE_TTL_DAYS", DEFAULT_TTL_DAYS)) * 86400
+
+
+def repo_version(repo_path: str) -> tuple:
+    """
+    Cheap fingerprint of the repo's state.
+    
+    For git repos: mtimes of .git/HEAD and .git/index, which change on checkout,
+    commit and staging. Otherwise: the repo directory's own mtime.
+    """
+    git_dir = os.path.join(repo_path, ".git")
+    if os.path.isdir(git_dir):
+        version = []
+        for name in ("HEAD", "index"):
+            try:
+                version.append(os.stat(os.path.join(git_dir, name)).st_mtime_ns)
+            except OSError:
+                version.append(None)
+        return tuple(version)
+    try:
+        return (os.stat(repo_path).st_mtime_ns,)
+    except OSError:
+        return (None,)
+
+
+def make_key(prompt: str, repo_path: str, max_turns: int, session_id: str = "") -> str:
+    """Hash the inputs that determine a Claude response, including the repo's current version."""
+    version = ",".join(str(v) for v in repo_version(repo_path))
+    return hashlib.sha256(
+        (repo_path + "\0" + version + "\0" + prompt + "\0" + str(max_turns) + "\0" + session_id).encode()
+    ).hexdigest()
+
+
+def get(key: str) -> Optional[Any]:
+    """Return the cached value for key, or None if missing or expired."""
+    path = os.path.join(CACHE_DIR, f"{key}.json")
+    try:
+        if time.time() - os.path.getmtime(path) > TTL_SECONDS:
+            os.remove(path)
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def set(key: str, value: Any):
+    """Store value under key (atomically, so concurrent readers never see partial files)."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    prune()
+    path = os.path.join(CACHE_DIR, f"{key}.json")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(value, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def prune():
+    """Delete expired entries, including ones orphaned by a repo version change."""
+    cutoff = time.time() - TTL_SECONDS
+    try:
+        entries = list(os.scandir(CACHE_DIR))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
@@ -2,17 +2,23 @@
 Simple Logger for Repo Agent.
 
 - {task_id}.log        - System logs
-- {task_id}_claude.log - Claude Code stream (written by graph.py)
+- {task_id}_{node}_claude.log - Claude Code stream (written by claude.py)
 """
 
 import os
+import time
+import queue
+import atexit
 import logging
-from datetime import datetime
+import threading
+from collections import OrderedDict
 from typing import Dict, Any
 
 
 class SimpleLogger:
     
+    MAX_OPEN_FILES = 64  # Log fds kept open by the writer thread (LRU)
+    
     def __init__(self, base_log_dir: str = None):
         if base_log_dir is None:
             project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -20,6 +26,8 @@ class SimpleLogger:
         
         self.base_log_dir = base_log_dir
         os.makedirs(base_log_dir, exist_ok=True)
+        # Log files are opened relative to this fd (openat), skipping full path resolution
+        self._dir_fd = os.open(base_log_dir, os.O_RDONLY | os.O_DIRECTORY)
         
         # Console logger
         self.console = logging.getLogger('repo_agent')
@@ -28,19 +36,107 @@ class SimpleLogger:
             handler = logging.StreamHandler()
             handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s'))
             self.console.addHandler(handler)
+        
+        # Second-resolution timestamp cache (strftime is slow)
+        self._cached_ts_epoch = 0
+        self._cached_ts_str = ""
+        
+        # File writes happen on a background thread; log() only enqueues
+        self._q = queue.SimpleQueue()
+        self._fds: "OrderedDict[str, int]" = OrderedDict()  # Owned by the writer thread
+        self._writer = threading.Thread(target=self._run_writer, name="repo_agent-log-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self._flush)
     
     def log(self, task_id: str, message: str, level: str = "INFO", details: Dict[str, Any] = None):
         """Log to system log file."""
-        log_file = os.path.join(self.base_log_dir, f"{task_id}.log")
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_file = f"{task_id}.log"
+        timestamp = self.timestamp()
         
-        with open(log_file, 'a') as f:
-            f.write(f"[{timestamp}] [{level}] {message}\n")
-            if details:
-                for key, value in details.items():
-                    f.write(f"  {key}: {value}\n")
+        line = f"[{timestamp}] [{level}] {message}\n"
+        if details:
+            line += "".join(f"  {key}: {value}\n" for key, value in details.items())
+        self._q.put((log_file, line))
         
         self.console.info(f"[{task_id}] {message}")
+    
+    def timestamp(self) -> str:
+        """Current local time as "%Y-%m-%d %H:%M:%S", formatted at most once per second."""
+        now = int(time.time())
+        if now != self._cached_ts_epoch:
+            self._cached_ts_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+            self._cached_ts_epoch = now
+        return self._cached_ts_str
+    
+    def _run_writer(self):
+        """Drain the queue, opening each log file once per batch."""
+        while True:
+            batch = [self._q.get()]
+            try:
+                while True:
+                    batch.append(self._q.get_nowait())
+            except queue.Empty:
+                pass
+            
+            by_file: Dict[str, list] = {}
+            stop = False
+            for item in batch:
+                if item is None:
+                    stop = True
+                    continue
+                log_file, line = item
+                by_file.setdefault(log_file, []).append(line)
+            
+            for log_file, lines in by_file.items():
+                try:
+                    # One unencodable line (e.g. a lone surrogate) must not drop its neighbours
+                    data = "".join(lines).encode(errors="replace")
+                    try:
+                        self._append(log_file, data)
+                    except FileNotFoundError:
+                        # Log directory was removed mid-run: recreate it and retry once
+                        self._close_fds()
+                        os.makedirs(self.base_log_dir, exist_ok=True)
+                        os.close(self._dir_fd)
+                        self._dir_fd = os.open(self.base_log_dir, os.O_RDONLY | os.O_DIRECTORY)
+                        self._append(log_file, data)
+                except Exception as e:
+                    # Never let one bad batch kill the writer (the queue would then grow forever)
+                    self.console.warning(f"Failed to write {log_file}: {e}")
+            
+            if stop:
+                self._close_fds()
+                return
+    
+    def _append(self, log_file: str, data: bytes):
+        """Append data to a file in the log directory, reusing its fd while the file still exists."""
+        fd = self._fds.get(log_file)
+        if fd is not None and os.fstat(fd).st_nlink == 0:
+            # File was deleted (e.g. `make clean`): drop the stale fd and recreate it
+            os.close(self._fds.pop(log_file))
+            fd = None
+        if fd is None:
+            fd = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644, dir_fd=self._dir_fd)
+            self._fds[log_file] = fd
+            if len(self._fds) > self.MAX_OPEN_FILES:
+                os.close(self._fds.popitem(last=False)[1])
+        else:
+            self._fds.move_to_end(log_file)
+        
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    
+    def _close_fds(self):
+        """Close every cached log fd."""
+        while self._fds:
+            os.close(self._fds.popitem()[1])
+    
+    def _flush(self):
+        """Write out everything queued so far and stop the writer (called at exit)."""
+        if self._writer.is_alive():
+            self._q.put(None)
+            self._writer.join(timeout=5)
 
 
 logger = SimpleLogger()
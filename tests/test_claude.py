@@ -0,0 +1,43 @@
+"""Tests for ClaudeAgent.call's use of the response cache."""
+
+import asyncio
+import json
+
+import pytest
+
+from repo_agent.claude import claude_agent
+from repo_agent.utils import llm_cache
+
+
+@pytest.fixture
+def fake_cli(tmp_path, monkeypatch):
+    """A stand-in Claude CLI that emits a single stream-json result event; returns the repo dir."""
+    script = tmp_path / "claude"
+    script.write_text('#!/bin/sh\necho \'{"type":"result","result":"fresh answer","session_id":"s1"}\'\n')
+    script.chmod(0o755)
+    monkeypatch.setattr(claude_agent, "claude_path", str(script))
+    monkeypatch.setattr(llm_cache, "CACHE_DIR", str(tmp_path / "llm_cache"))
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    return repo
+
+
+def call(repo_path):
+    return asyncio.run(claude_agent.call("prompt", str(repo_path), "test", "node"))
+
+
+def test_cache_hit_skips_the_cli(fake_cli):
+    key = llm_cache.make_key("prompt", str(fake_cli), claude_agent.max_turns)
+    llm_cache.set(key, ["cached answer", 12.0, 0, "s0"])
+    assert call(fake_cli) == ("cached answer", 0.0, 0, "s0")
+
+
+@pytest.mark.parametrize("entry", [[], ["answer"], {"result": "answer"}, [None, 1.0, 0, "s0"], "answer"])
+def test_malformed_cache_entry_is_a_miss(fake_cli, entry):
+    key = llm_cache.make_key("prompt", str(fake_cli), claude_agent.max_turns)
+    llm_cache.set(key, entry)
+    output, _, exit_code, session_id = call(fake_cli)
+    assert (output, exit_code, session_id) == ("fresh answer", 0, "s1")
+    # ...and the fresh result replaces the bad entry
+    with open(f"{llm_cache.CACHE_DIR}/{key}.json") as f:
+        assert json.load(f)[0] == "fresh answer"
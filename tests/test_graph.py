@@ -0,0 +1,82 @@
+"""Tests for the validator node and its fast path in repo_agent.graph."""
+
+import asyncio
+
+import pytest
+
+from repo_agent import graph
+from repo_agent.graph import fast_validate
+
+
+QUERY = "What are the probes used in the repo?"
+
+
+def test_fast_validate_accepts_answer_with_code_citations():
+    answer = ("The probes are defined in pkg/core/hooks/probes.go and attached by the eBPF loader "
+              "in `LoadHooks`, which registers a kprobe for each syscall it traces. ") * 2
+    assert fast_validate(answer, QUERY) == "VALID"
+
+
+def test_fast_validate_rejects_prose_without_code_citations():
+    answer = ("The probes likely handle input/output between the client/server layers. It is hard to "
+              "say exactly which probes are used without looking further, but they probably sit "
+              "somewhere in the core of the repo and deal with network traffic in general terms.")
+    assert len(answer) > 200
+    assert fast_validate(answer, QUERY) is None
+
+
+def test_fast_validate_rejects_errors_and_short_answers():
+    assert fast_validate("Error: Timed out after 300s " + "x" * 300, QUERY) is None
+    assert fast_validate("See `probes.go`.", QUERY) is None
+
+
+def stub_checks(monkeypatch, correctness, completeness):
+    """Stub claude_agent.call; each check waits until both have started, so it only passes if they run concurrently."""
+    started = []
+    both_started = asyncio.Event()
+
+    async def call(prompt, repo_path, task_id, node, **kwargs):
+        started.append(node)
+        if len(started) == 2:
+            both_started.set()
+        await asyncio.wait_for(both_started.wait(), timeout=1)
+        return (correctness if "correctness" in node else completeness), 1.0, 0, ""
+
+    monkeypatch.setattr(graph.claude_agent, "call", call)
+    return started
+
+
+def validate(answer="Too short to pass the fast path."):
+    return asyncio.run(graph.validator_node({
+        "task_id": "test", "query": QUERY, "repo_path": "/tmp",
+        "answer": answer, "session_id": "s1", "iteration": 1
+    }))
+
+
+def test_validator_runs_both_checks_concurrently(monkeypatch):
+    started = stub_checks(monkeypatch, "VALID", "VALID")
+    result = validate()
+    assert sorted(started) == ["validator_completeness_v1", "validator_correctness_v1"]
+    assert result == {"validation": "VALID", "validation_status": "VALID", "feedback": "", "iteration": 1}
+
+
+@pytest.mark.parametrize("correctness, completeness, status, feedback", [
+    ("INVALID: wrong file", "PARTIAL: missing x", "INVALID", "INVALID: wrong file\n\nPARTIAL: missing x"),
+    ("INVALID: wrong file", "VALID", "INVALID", "INVALID: wrong file"),
+    ("VALID", "PARTIAL: missing x", "PARTIAL", "PARTIAL: missing x"),
+    ("Looks fine to me", "VALID", "VALID", ""),
+])
+def test_validator_merges_check_results(monkeypatch, correctness, completeness, status, feedback):
+    stub_checks(monkeypatch, correctness, completeness)
+    result = validate()
+    assert result["validation_status"] == status
+    assert result["feedback"] == feedback
+    assert result["iteration"] == (1 if status == "VALID" else 2)
+
+
+def test_validator_fast_path_skips_claude(monkeypatch):
+    started = stub_checks(monkeypatch, "INVALID: unused", "PARTIAL: unused")
+    answer = ("The probes are defined in pkg/core/hooks/probes.go and attached by the eBPF loader "
+              "in `LoadHooks`, which registers a kprobe for each syscall it traces. ") * 2
+    assert validate(answer)["validation_status"] == "VALID"
+    assert started == []
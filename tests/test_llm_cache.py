@@ -0,0 +1,94 @@
+"""Tests for the on-disk Claude response cache."""
+
+import os
+import time
+
+import pytest
+
+from repo_agent.utils import llm_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    path = tmp_path / "llm_cache"
+    monkeypatch.setattr(llm_cache, "CACHE_DIR", str(path))
+    return path
+
+
+def age(path, seconds):
+    """Push a file's mtime `seconds` into the past."""
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_set_then_get_round_trips(cache_dir):
+    llm_cache.set("k", ["answer", 1.5, 0, "s1"])
+    assert llm_cache.get("k") == ["answer", 1.5, 0, "s1"]
+    assert os.listdir(cache_dir) == ["k.json"]  # no .tmp left behind
+
+
+def test_missing_key_is_a_miss():
+    assert llm_cache.get("nope") is None
+
+
+def test_set_replaces_existing_value():
+    llm_cache.set("k", ["old"])
+    llm_cache.set("k", ["new"])
+    assert llm_cache.get("k") == ["new"]
+
+
+def test_failed_set_leaves_no_partial_files(cache_dir):
+    llm_cache.set("k", ["old"])
+    with pytest.raises(TypeError):
+        llm_cache.set("k", [object()])
+    assert os.listdir(cache_dir) == ["k.json"]
+    assert llm_cache.get("k") == ["old"]
+
+
+def test_expired_entry_is_a_miss_and_deleted(cache_dir, monkeypatch):
+    monkeypatch.setattr(llm_cache, "TTL_SECONDS", 60)
+    llm_cache.set("k", ["answer"])
+    age(cache_dir / "k.json", 120)
+    assert llm_cache.get("k") is None
+    assert not (cache_dir / "k.json").exists()
+
+
+def test_set_prunes_expired_entries(cache_dir, monkeypatch):
+    monkeypatch.setattr(llm_cache, "TTL_SECONDS", 60)
+    llm_cache.set("old", ["answer"])
+    age(cache_dir / "old.json", 120)
+    llm_cache.set("new", ["answer"])
+    assert sorted(os.listdir(cache_dir)) == ["new.json"]
+
+
+def test_ttl_is_read_from_env(monkeypatch):
+    import importlib
+    monkeypatch.setenv("CLAUDE_CACHE_TTL_DAYS", "0.5")
+    try:
+        assert importlib.reload(llm_cache).TTL_SECONDS == 43200
+    finally:
+        monkeypatch.delenv("CLAUDE_CACHE_TTL_DAYS")
+        importlib.reload(llm_cache)
+
+
+def test_key_depends_on_every_input(tmp_path):
+    base = llm_cache.make_key("prompt", str(tmp_path), 5, "s1")
+    assert base == llm_cache.make_key("prompt", str(tmp_path), 5, "s1")
+    assert len({
+        base,
+        llm_cache.make_key("other prompt", str(tmp_path), 5, "s1"),
+        llm_cache.make_key("prompt", str(tmp_path / "sub"), 5, "s1"),
+        llm_cache.make_key("prompt", str(tmp_path), 6, "s1"),
+        llm_cache.make_key("prompt", str(tmp_path), 5, "s2"),
+        llm_cache.make_key("prompt", str(tmp_path), 5),
+    }) == 6
+
+
+def test_key_changes_with_repo_version(tmp_path):
+    git_dir = tmp_path / ".git"
+    git_dir.mkdir()
+    (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+    (git_dir / "index").write_bytes(b"")
+    before = llm_cache.make_key("prompt", str(tmp_path), 5)
+    age(git_dir / "index", 10)
+    assert llm_cache.make_key("prompt", str(tmp_path), 5) != before
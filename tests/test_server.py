@@ -0,0 +1,93 @@
+"""Tests for the in-process answer cache in repo_agent.server."""
+
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+import repo_agent.server as server
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """A fake git repo as the server's REPO_PATH, with an empty answer cache."""
+    git_dir = tmp_path / ".git"
+    git_dir.mkdir()
+    (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+    (git_dir / "index").write_bytes(b"")
+    monkeypatch.setattr(server, "REPO_PATH", str(tmp_path))
+    monkeypatch.setattr(server, "ANSWER_CACHE", server.OrderedDict())
+    return tmp_path
+
+
+@pytest.fixture
+def workflow(monkeypatch):
+    """Stub run_review_critique; set `results[query]` to control what it returns."""
+    calls = []
+    results = {}
+
+    async def run_review_critique(query, repo_path, task_id=None):
+        calls.append(query)
+        return results.get(query, (f"answer to {query}", True))
+
+    monkeypatch.setattr(server, "run_review_critique", run_review_critique)
+    return calls, results
+
+
+def ask(client, query):
+    response = client.post("/", json={
+        "jsonrpc": "2.0",
+        "method": "message/send",
+        "id": "1",
+        "params": {"message": {"parts": [{"text": query}]}}
+    })
+    return response.json()["result"]["artifacts"][0]["parts"][0]["text"]
+
+
+def test_repeated_query_is_served_from_cache(repo, workflow):
+    calls, _ = workflow
+    client = TestClient(server.app)
+
+    assert ask(client, "q1") == "answer to q1"
+    assert ask(client, "q1") == "answer to q1"
+    assert calls == ["q1"]
+
+
+def test_least_recently_used_entry_is_evicted(repo, workflow, monkeypatch):
+    calls, _ = workflow
+    monkeypatch.setattr(server, "ANSWER_CACHE_MAX", 2)
+    client = TestClient(server.app)
+
+    ask(client, "q1")
+    ask(client, "q2")
+    ask(client, "q1")  # hit: q2 is now least recently used
+    ask(client, "q3")  # evicts q2
+    assert calls == ["q1", "q2", "q3"]
+
+    ask(client, "q1")
+    ask(client, "q2")
+    assert calls == ["q1", "q2", "q3", "q2"]
+
+
+def test_repo_change_invalidates_cache(repo, workflow):
+    calls, _ = workflow
+    client = TestClient(server.app)
+
+    ask(client, "q1")
+    index = repo / ".git" / "index"
+    stat = os.stat(index)
+    os.utime(index, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    ask(client, "q1")
+    assert calls == ["q1", "q1"]
+
+
+@pytest.mark.parametrize("failure", ["Unknown error", "", "Error: Timed out after 300s"])
+def test_failed_answers_are_not_cached(repo, workflow, failure):
+    calls, results = workflow
+    results["q1"] = (failure, False)
+    client = TestClient(server.app)
+
+    assert ask(client, "q1") == failure
+    del results["q1"]
+    assert ask(client, "q1") == "answer to q1"
+    assert calls == ["q1", "q1"]
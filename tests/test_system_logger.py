@@ -0,0 +1,14 @@
+"""Tests for SimpleLogger's background file writer."""
+
+from repo_agent.utils.system_logger import SimpleLogger
+
+
+def test_unencodable_line_does_not_drop_other_lines(tmp_path):
+    log = SimpleLogger(str(tmp_path))
+    log.log("t", "before")
+    log.log("t", "bad \udc80 line")
+    log.log("t", "after")
+    log._flush()
+
+    lines = (tmp_path / "t.log").read_text().splitlines()
+    assert [line.split("] ", 2)[2] for line in lines] == ["before", "bad ? line", "after"]